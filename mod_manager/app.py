@@ -143,7 +143,8 @@ class ModManagerApp:
             print(f"Directory does not exist: {folder_path}")  # DEBUG
             return
         try:
-            entries = sorted([d for d in os.listdir(folder_path) if os.path.isdir(os.path.join(folder_path, d))])
+            with os.scandir(folder_path) as it:
+                entries = sorted(e.name for e in it if e.is_dir())
             print(f"Entries found: {entries}")  # DEBUG
             for folder in entries:
                 self.installed_listbox.insert(tk.END, folder)
@@ -776,11 +777,10 @@ class ModManagerApp:
             response = requests.get(url, timeout=30, stream=True)
             response.raise_for_status()
 
-            # Download in chunks
+            # Download in 1 MiB chunks straight from the socket
+            response.raw.decode_content = True
             with open(zip_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+                shutil.copyfileobj(response.raw, f, length=1024 * 1024)
             
             logging.info(f"Download complete")
 
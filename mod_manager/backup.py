@@ -252,11 +252,12 @@ class BackupViewerCreator:
         """populate left list with folders from selected directory."""
         self.left_list.delete(0, tk.END)
         folders = []
-        for e in os.listdir(self.folder):
-            p = os.path.join(self.folder, e)
-            if os.path.isdir(p):
-                ctime = datetime.fromtimestamp(os.path.getctime(p))
-                folders.append((e, ctime))
+        # scandir gives the entry type without a stat per entry.
+        with os.scandir(self.folder) as it:
+            for e in it:
+                if e.is_dir():
+                    ctime = datetime.fromtimestamp(e.stat().st_ctime)
+                    folders.append((e.name, ctime))
         
         # sort based on user selection.
         opt = self.lsort_var.get()
@@ -276,13 +277,17 @@ class BackupViewerCreator:
         entries = []
         
         # scan backup directory for zip files and their metadata.
-        for fn in os.listdir(backup_dir):
+        with os.scandir(backup_dir) as it:
+            names = [e.name for e in it if e.is_file()]
+        files = set(names)
+        for fn in names:
             if not fn.endswith('.zip'): continue
             
             # try to load metadata from companion json file.
-            sc = os.path.join(backup_dir, fn.replace('.zip','.json'))
+            sc_name = fn.replace('.zip','.json')
+            sc = os.path.join(backup_dir, sc_name)
             meta = {}
-            if os.path.isfile(sc):
+            if sc_name in files:
                 try:
                     meta = json.load(open(sc))
                 except:
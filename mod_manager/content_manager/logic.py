@@ -505,11 +505,10 @@ class ContentManagerLogic:
             response = requests.get(url, timeout=30, stream=True)
             response.raise_for_status()
 
-            # download in chunks
+            # download in 1 MiB chunks straight from the socket
+            response.raw.decode_content = True
             with open(zip_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+                shutil.copyfileobj(response.raw, f, length=1024 * 1024)
             
             logging.info(f"Download complete")
 
@@ -6,7 +6,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from zipfile import ZipFile
 import tarfile
-from io import BytesIO
+import shutil
+import tempfile
 import webbrowser
 import re
 import json
@@ -279,6 +280,7 @@ class CataInstallerApp:
         url = asset["browser_download_url"]
         name = asset["name"]
 
+        data = None
         try:
             # create non-blocking status window
             status_window = tk.Toplevel(self.root)
@@ -292,9 +294,14 @@ class CataInstallerApp:
             
             self.root.update()
             
-            response = requests.get(url, stream=True)
-            response.raise_for_status()
-            data = BytesIO(response.content)
+            # stream the archive to a temp file in 1 MiB blocks rather than
+            # holding the whole release in memory.
+            data = tempfile.TemporaryFile()
+            with requests.get(url, stream=True) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                shutil.copyfileobj(response.raw, data, length=1024 * 1024)
+            data.seek(0)
             
             # close status window
             status_window.destroy()
@@ -386,6 +393,9 @@ class CataInstallerApp:
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to download or extract:\n{e}")
+        finally:
+            if data is not None:
+                data.close()
 
     def launch_game(self):
         exe_path = ""
@@ -2,17 +2,32 @@
 
 import tkinter as tk
 from tkinter import messagebox, ttk, Toplevel, Label
+import tkinter.font as tkfont
 import subprocess
 import os
 import sys
 import logging
+import logging.handlers
+from functools import partial
+
+
+def _get_logger():
+    """Return the selector logger, attaching the file handler on first use.
+
+    The handler goes on the root logger so the updater's logging.* calls
+    land in mod_debug.log too. delay=True keeps the file closed until
+    something is actually written.
+    """
+    root_logger = logging.getLogger()
+    if not root_logger.handlers:
+        handler = logging.handlers.RotatingFileHandler(
+            "mod_debug.log", maxBytes=1_000_000, backupCount=2, delay=True
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+        root_logger.addHandler(handler)
+        root_logger.setLevel(logging.DEBUG)
+    return logging.getLogger("cata_mm.selector")
 
-# Setup logging
-logging.basicConfig(
-    filename='mod_debug.log',
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 
 # Import updater
 try:
@@ -20,7 +35,7 @@ try:
     UPDATER_AVAILABLE = True
 except ImportError:
     UPDATER_AVAILABLE = False
-    logging.warning("Updater module not available")
+    _get_logger().warning("Updater module not available")
 
 TOOLS = [
     ("Game Launcher", "launcher.py"),
@@ -36,7 +51,7 @@ def launch_tool(script_name):
         return
     # Use sys.executable to launch with the same Python interpreter
     try:
-        subprocess.Popen([sys.executable, script_path])
+        subprocess.Popen([sys.executable, script_path], close_fds=True)
     except Exception as e:
         messagebox.showerror("Error", f"Failed to launch {script_name}:\n{e}")
 
@@ -46,14 +61,27 @@ class MultitoolApp:
         
         # Initialize updater
         if UPDATER_AVAILABLE:
+            # the updater logs through the root logger, starting with the
+            # check it kicks off in its constructor.
+            _get_logger()
             self.updater = Updater()
             self.version = self.updater.get_current_version()
         else:
             self.updater = None
             self.version = "Unknown"
         
+        # shared bold fonts, created once instead of parsed per widget
+        self.font_bold_14 = tkfont.Font(root, family="TkDefaultFont", size=14, weight="bold")
+        self.font_bold_12 = tkfont.Font(root, family="TkDefaultFont", size=12, weight="bold")
+        self.font_bold_11 = tkfont.Font(root, family="TkDefaultFont", size=11, weight="bold")
+        self.font_bold_10 = tkfont.Font(root, family="TkDefaultFont", size=10, weight="bold")
+        
+        # version strings are fixed for the process lifetime; build them once
+        self._version_text = f"Current Version: v{self.version}"
+        self._title_text = f"Cataclysm Multitool v{self.version}"
+        
         # Set title with version
-        self.root.title(f"Cataclysm Multitool v{self.version}")
+        self.root.title(self._title_text)
         self.root.geometry("400x300")
         
         # Main label
@@ -62,7 +90,7 @@ class MultitoolApp:
         
         # Tool buttons
         for tool_name, script in TOOLS:
-            btn = tk.Button(root, text=tool_name, width=25, command=lambda s=script: launch_tool(s))
+            btn = tk.Button(root, text=tool_name, width=25, command=partial(launch_tool, script))
             btn.pack(pady=5)
         
         # Community & Updates button at bottom
@@ -86,13 +114,14 @@ class MultitoolApp:
         window.title("Community & Updates")
         window.geometry("500x600")
         window.transient(self.root)
-        window.grab_set()
+        # build hidden so Tk lays the window out once, not after every pack()
+        window.withdraw()
         
         # Title
         title_label = Label(
             window,
             text="Cataclysm: Bright Nights Community",
-            font=("TkDefaultFont", 14, "bold")
+            font=self.font_bold_14
         )
         title_label.pack(pady=15)
         
@@ -104,12 +133,12 @@ class MultitoolApp:
             tk.Label(
                 update_section,
                 text="Multitool Updates:",
-                font=("TkDefaultFont", 11, "bold")
+                font=self.font_bold_11
             ).pack()
             
             version_label = Label(
                 update_section,
-                text=f"Current Version: v{self.version}",
+                text=self._version_text,
                 fg="gray"
             )
             version_label.pack(pady=5)
@@ -117,7 +146,11 @@ class MultitoolApp:
             self.community_update_button = tk.Button(
                 update_section,
                 text="Check for Updates",
-                command=lambda: self._check_for_updates_in_community(window),
+                command=lambda: self._run_update_check(
+                    self.community_update_button,
+                    self.community_original_button_config,
+                    window
+                ),
                 width=30
             )
             self.community_update_button.pack(pady=5)
@@ -126,16 +159,14 @@ class MultitoolApp:
             github_btn = tk.Button(
                 update_section,
                 text="📦 Multitool GitHub",
-                command=lambda: webbrowser.open("https://github.com/shmakota/cata_git_mod_manager"),
+                command=partial(webbrowser.open, "https://github.com/shmakota/cata_git_mod_manager"),
                 width=30
             )
             github_btn.pack(pady=(5, 0))
             
             # Store original button configuration
             self.community_original_button_config = {
-                'width': 30,
-                'fg': self.community_update_button.cget('fg'),
-                'font': self.community_update_button.cget('font')
+                'text': self.community_update_button.cget('text')
             }
         else:
             tk.Label(
@@ -155,7 +186,7 @@ class MultitoolApp:
         tk.Label(
             links_frame,
             text="Community Links:",
-            font=("TkDefaultFont", 11, "bold")
+            font=self.font_bold_11
         ).pack(pady=(0, 10))
         
         # Define community links
@@ -172,7 +203,7 @@ class MultitoolApp:
             btn = tk.Button(
                 links_frame,
                 text=label,
-                command=lambda u=url: webbrowser.open(u),
+                command=partial(webbrowser.open, url),
                 width=40,
                 anchor="w"
             )
@@ -185,122 +216,61 @@ class MultitoolApp:
             command=window.destroy,
             width=15
         ).pack(pady=(10, 15))
-    
-    def _check_for_updates_in_community(self, parent_window):
-        """Check for updates from within the community window"""
-        if not UPDATER_AVAILABLE:
-            messagebox.showerror("Error", "Updater module not available", parent=parent_window)
-            return
-        
-        # Update button to show checking
-        original_text = self.community_update_button.cget("text")
-        self.community_update_button.config(
-            text="Checking...",
-            state="disabled",
-            width=self.community_original_button_config['width']
-        )
-        parent_window.update()
         
-        try:
-            has_update, latest_version, download_url, release_notes = self.updater.check_for_updates()
-            
-            if has_update and latest_version:
-                # Update button appearance
-                self.community_update_button.config(
-                    text=f"Update Available (v{latest_version})",
-                    fg="green",
-                    font=self.community_original_button_config['font'],
-                    state="normal",
-                    width=self.community_original_button_config['width']
-                )
-                # Close community window and show update dialog
-                parent_window.destroy()
-                self._show_update_dialog(latest_version, download_url, release_notes)
-            else:
-                # Reset button
-                self.community_update_button.config(
-                    text=original_text,
-                    state="normal",
-                    fg=self.community_original_button_config['fg'],
-                    font=self.community_original_button_config['font'],
-                    width=self.community_original_button_config['width']
-                )
-                messagebox.showinfo(
-                    "No Updates",
-                    f"You are running the latest version (v{self.version}).",
-                    parent=parent_window
-                )
-        except Exception as e:
-            # Reset button on error
-            self.community_update_button.config(
-                text=original_text,
-                state="normal",
-                fg=self.community_original_button_config['fg'],
-                font=self.community_original_button_config['font'],
-                width=self.community_original_button_config['width']
-            )
-            messagebox.showerror(
-                "Update Check Failed",
-                f"Failed to check for updates:\n{e}",
-                parent=parent_window
-            )
+        window.update_idletasks()
+        window.deiconify()
+        window.grab_set()
     
-    def _check_for_updates(self):
-        """Manual update check triggered by button"""
+    def _run_update_check(self, button, defaults, parent):
+        """Check for updates, showing progress on the given button
+        
+        Args:
+            button: Button that triggered the check
+            defaults: Button options to restore once the check finishes
+            parent: Window that owns the button (closed if an update is found)
+        """
         if not UPDATER_AVAILABLE:
-            messagebox.showerror("Error", "Updater module not available")
+            messagebox.showerror("Error", "Updater module not available", parent=parent)
             return
         
-        # Update button to show checking
-        original_text = self.update_button.cget("text")
-        self.update_button.config(
-            text="Checking...",
-            state="disabled",
-            width=self.original_button_config['width']
-        )
-        self.root.update()
+        button.config(text="Checking...", state="disabled")
+        reset_kwargs = dict(defaults, state="normal")
         
-        try:
-            has_update, latest_version, download_url, release_notes = self.updater.check_for_updates()
+        # the check runs on a background thread; poll it so the window
+        # keeps repainting while GitHub answers.
+        future = self.updater.check_for_updates_async()
+        
+        def poll_check():
+            if not future.done():
+                self.root.after(100, poll_check)
+                return
+            if not parent.winfo_exists():
+                return
+            try:
+                result = future.result()
+                has_update, latest_version, download_url, release_notes = result
+            except Exception as e:
+                button.config(**reset_kwargs)
+                messagebox.showerror(
+                    "Update Check Failed",
+                    f"Failed to check for updates:\n{e}",
+                    parent=parent
+                )
+                return
             
             if has_update and latest_version:
-                # Update button appearance to show update available (keep consistent size)
-                self.update_button.config(
-                    text=f"Update Available (v{latest_version})",
-                    fg="green",
-                    font=self.original_button_config['font'],
-                    state="normal",
-                    width=self.original_button_config['width']
-                )
+                # close the calling window and show update dialog
+                parent.destroy()
                 self._show_update_dialog(latest_version, download_url, release_notes)
             else:
-                # Reset button to normal
-                self.update_button.config(
-                    text=original_text,
-                    state="normal",
-                    fg=self.original_button_config['fg'],
-                    font=self.original_button_config['font'],
-                    width=self.original_button_config['width']
-                )
+                button.config(**reset_kwargs)
                 messagebox.showinfo(
                     "No Updates",
                     f"You are running the latest version (v{self.version}).",
-                    parent=self.root
+                    parent=parent
                 )
-        except Exception as e:
-            # Reset button to normal on error
-            self.update_button.config(
-                text=original_text,
-                state="normal",
-                fg=self.original_button_config['fg'],
-                font=self.original_button_config['font'],
-                width=self.original_button_config['width']
-            )
-            messagebox.showerror(
-                "Update Check Failed",
-                f"Failed to check for updates:\n{e}",
-                parent=self.root
-            )
+        
+        self.root.after(100, poll_check)
     
     def _show_update_dialog(self, latest_version, download_url, release_notes):
         """Show dialog with update details and option to install"""
@@ -308,25 +278,25 @@ class MultitoolApp:
         dialog.title("Update Available")
         dialog.geometry("600x450")
         dialog.transient(self.root)
-        dialog.grab_set()
+        dialog.withdraw()
         
         # Title
         title_label = Label(
             dialog,
             text=f"Version {latest_version} is available!",
-            font=("TkDefaultFont", 12, "bold")
+            font=self.font_bold_12
         )
         title_label.pack(pady=10)
         
         # Current version
-        current_label = Label(dialog, text=f"Current version: {self.version}")
+        current_label = Label(dialog, text=self._version_text)
         current_label.pack()
         
         # Release notes with scrollbar
         notes_frame = tk.Frame(dialog)
         notes_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        tk.Label(notes_frame, text="Release Notes:", font=("TkDefaultFont", 10, "bold")).pack(anchor="w")
+        tk.Label(notes_frame, text="Release Notes:", font=self.font_bold_10).pack(anchor="w")
         
         # Text widget with scrollbar
         notes_container = tk.Frame(notes_frame)
@@ -364,6 +334,10 @@ class MultitoolApp:
         
         tk.Button(button_frame, text="Update Now", command=do_update, width=15).pack(side=tk.LEFT, padx=5)
         tk.Button(button_frame, text="Later", command=dialog.destroy, width=15).pack(side=tk.LEFT, padx=5)
+        
+        dialog.update_idletasks()
+        dialog.deiconify()
+        dialog.grab_set()
     
     def _perform_update(self, download_url, new_version):
         """Perform the update with progress indication"""
@@ -372,59 +346,96 @@ class MultitoolApp:
         progress_dialog.title("Updating...")
         progress_dialog.geometry("400x150")
         progress_dialog.transient(self.root)
-        progress_dialog.grab_set()
+        progress_dialog.withdraw()
         
         status_label = Label(progress_dialog, text="Downloading update...", wraplength=350)
         status_label.pack(expand=True, pady=20)
         
-        progress_dialog.update()
+        progress_dialog.update_idletasks()
+        progress_dialog.deiconify()
+        progress_dialog.grab_set()
+        
+        # the update runs on a worker thread so the window keeps repainting;
+        # closing anything mid-update would leave a half-installed tree.
+        future = self.updater.perform_update_async(download_url, new_version)
+        progress_dialog.protocol("WM_DELETE_WINDOW", lambda: None)
+        self.root.protocol("WM_DELETE_WINDOW", lambda: None)
         
-        def update_worker():
+        def poll_update():
+            if not future.done():
+                self.root.after(100, poll_update)
+                return
+            
+            self.root.protocol("WM_DELETE_WINDOW", self.root.destroy)
+            progress_dialog.destroy()
             try:
-                success = self.updater.perform_update(download_url, new_version)
-                progress_dialog.destroy()
-                
-                if success:
-                    # Show success message and restart
-                    messagebox.showinfo(
-                        "Update Complete",
-                        "Update installed successfully!\n\nThe application will now restart.",
-                        parent=self.root
-                    )
-                    
-                    # Restart the application
-                    self._restart_application()
-                else:
-                    messagebox.showerror(
-                        "Update Failed",
-                        "Failed to install update. Check mod_debug.log and update_history.log for details.",
-                        parent=self.root
-                    )
+                success = future.result()
             except Exception as e:
-                progress_dialog.destroy()
                 messagebox.showerror(
                     "Update Error",
                     f"An error occurred during update:\n{e}",
                     parent=self.root
                 )
+                return
+            
+            if success:
+                # Show success message and restart
+                messagebox.showinfo(
+                    "Update Complete",
+                    "Update installed successfully!\n\nThe application will now restart.",
+                    parent=self.root
+                )
+                
+                # Restart the application
+                self._restart_application()
+            else:
+                messagebox.showerror(
+                    "Update Failed",
+                    "Failed to install update. Check mod_debug.log and update_history.log for details.",
+                    parent=self.root
+                )
         
-        # Run update in background
-        self.root.after(100, update_worker)
+        self.root.after(100, poll_update)
     
     def _restart_application(self):
         """Restart the application"""
+        python = sys.executable
+        _get_logger().info(f"Restarting application with: {python} {sys.argv}")
         try:
-            python = sys.executable
-            logging.info(f"Restarting application with: {python} {sys.argv}")
-            os.execl(python, python, *sys.argv)
+            if os.name == "nt":
+                # os.exec* on Windows spawns a child and exits anyway; launch it
+                # detached so it doesn't wait on this process's teardown
+                subprocess.Popen(
+                    [python] + sys.argv,
+                    creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP,
+                    close_fds=True
+                )
+            else:
+                # flush the log before the process image is replaced
+                for handler in logging.getLogger().handlers:
+                    handler.close()
         except Exception as e:
-            logging.error(f"Failed to restart application: {e}")
-            messagebox.showwarning(
-                "Restart Manually",
-                f"Update completed successfully!\n\nPlease restart the application manually to use the new version.\n\nTechnical details: {e}",
-                parent=self.root
-            )
+            self._show_restart_manually(e, parent=self.root)
             self.root.quit()
+            return
+        
+        self.root.destroy()
+        if os.name == "nt":
+            sys.exit(0)
+        try:
+            os.execv(python, [python, *sys.argv])
+        except OSError as e:
+            # root is already gone, so the warning gets its own window
+            self._show_restart_manually(e)
+    
+    def _show_restart_manually(self, error, parent=None):
+        """Tell the user to restart by hand after a failed automatic restart"""
+        _get_logger().error(f"Failed to restart application: {error}")
+        messagebox.showwarning(
+            "Restart Manually",
+            f"Update completed successfully!\n\nPlease restart the application manually to use the new version.\n\nTechnical details: {error}",
+            parent=parent
+        )
 
 def main():
     root = tk.Tk()
@@ -1,57 +1,279 @@
 import os
+import errno
 import json
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import zipfile
 import shutil
 import tempfile
+import contextlib
+import subprocess
 import sys
+import time
 import logging
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 
+# orjson is optional; it parses and writes JSON noticeably faster.
+try:
+    import orjson
+    _loads = orjson.loads
+    
+    def _dumps(data):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    
+    def _dumps(data):
+        return json.dumps(data, indent=2).encode('utf-8')
+
+# packaging is optional; it understands pre-releases like "1.1.0rc1".
+try:
+    from packaging.version import Version, InvalidVersion
+except ImportError:
+    Version = None
+
 VERSION_FILE = "version.json"  # Tool version (ships with releases, gets overwritten)
 CONFIG_FILE = "cfg/mod_manager_config.json"  # User config (preserved)
 UPDATE_LOG_FILE = "update_history.log"  # Permanent update log (never deleted)
-BASE_PRESERVED_DIRS = ["cfg", "mods"]  # Always preserve these directories
-PRESERVED_FILES = ["mod_debug.log", "update_history.log"]  # Files to preserve during update
+BASE_PRESERVED_DIRS = frozenset({"cfg", "mods"})  # Always preserve these directories
+PRESERVED_FILES = frozenset({  # Files to preserve during update (mod_debug.log rotates to .1/.2)
+    "mod_debug.log", "mod_debug.log.1", "mod_debug.log.2", "update_history.log"
+})
+_VERSION_RE = re.compile(r'(\d+\.\d+\.\d+)')  # Version inside a release name
+_SEMVER_RE = re.compile(r'(\d+(?:\.\d+)*)(?:[-_.]?([A-Za-z]+)[-_.]?(\d*))?')  # "1.0.5", "1.0.5rc1", "1.0.5-beta"
+# pre-release tags understood without packaging, in release order
+_PRE_RELEASE_RANKS = {'a': 0, 'alpha': 0, 'b': 1, 'beta': 1, 'rc': 2, 'pre': 2}
+_SHA256_RE = re.compile(r'sha256:\s*([0-9a-f]{64})\b', re.IGNORECASE)  # Checksums listed in release notes
+_SHA256_FILE_RE = re.compile(r'^([0-9a-f]{64})\b', re.IGNORECASE)  # sha256sum-style checksum assets
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # Read/write block size for release downloads
+EXTRACT_CHUNK_SIZE = 256 * 1024  # Per-read size when decompressing members (zipfile's default is far smaller)
+DOWNLOAD_SPOOL_SIZE = 64 * 1024 * 1024  # Release archives up to this size never touch the disk
+UNZIP_MIN_SIZE = 32 * 1024 * 1024  # Archives larger than this are extracted with the system unzip
+PARALLEL_EXTRACT_MIN_FILES = 64  # Below this, thread pool setup costs more than it saves
+# extraction and copies of many small files wait on syscalls more than the CPU
+IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+PREFETCH_MAX_AGE = 600  # Seconds a successful startup update check may be reused
+
+
+@lru_cache(maxsize=32)
+def _parse_version(version):
+    """Parse a version string into something comparable
+    
+    Uses packaging.version when installed. Otherwise "v1.0.5" -> ((1, 0, 5),
+    True, (0, 0)), with pre-releases like "1.0.5rc1" or "1.0.5-beta" sorting
+    before the final release (alpha < beta < rc). Any other suffix, such as
+    "1.0.5.post1" or "1.0.5-dev", returns None. Either way "1.0" and "1.0.0"
+    compare equal, and None is returned for non-numeric versions like
+    "update_test". Results are cached, since the same few tags get compared on
+    every update check.
+    """
+    if not isinstance(version, str):
+        return None
+    version = version.strip()
+    if version[:1] in ('v', 'V'):
+        version = version[1:]
+    if Version is not None:
+        try:
+            return Version(version)
+        except InvalidVersion:
+            return None
+    match = _SEMVER_RE.fullmatch(version)
+    if not match:
+        return None
+    release, pre_name, pre_num = match.groups()
+    pre_rank = 0
+    if pre_name is not None:
+        pre_rank = _PRE_RELEASE_RANKS.get(pre_name.lower())
+        if pre_rank is None:
+            return None
+    parts = [int(x) for x in release.split('.')]
+    while parts and parts[-1] == 0:
+        parts.pop()
+    # final releases sort after any pre-release of the same version.
+    return tuple(parts), pre_name is None, (pre_rank, int(pre_num or 0))
+
+
+def _fast_copy(src, dst):
+    """Copy a file with os.copy_file_range so the data never leaves the kernel
+    
+    Falls back to shutil.copy2 where copy_file_range is missing (non-Linux) or
+    refused by the filesystem. Usable as a copytree copy_function.
+    """
+    if not hasattr(os, "copy_file_range"):
+        return shutil.copy2(src, dst)
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except OSError as e:
+        if e.errno not in (errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP):
+            raise
+        return shutil.copy2(src, dst)
+    shutil.copystat(src, dst)
+    return dst
+
+
+def _run_in_thread(fn, *args, daemon=True):
+    """Call fn(*args) on a new thread
+    
+    Returns:
+        Future: resolves to fn's return value, or raises what fn raised
+    """
+    future = Future()
+    
+    def run():
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=run, daemon=daemon).start()
+    return future
+
+
+def _make_session():
+    """Create the HTTP session shared by every Updater
+    
+    Transient gateway errors are retried with backoff.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 
 class Updater:
+    # one session for the whole process, so api.github.com connections (and
+    # their TLS handshakes) are reused across calls and Updater instances.
+    _session = _make_session()
+    
     def __init__(self):
+        # parsed JSON files, reloaded when the file changes (see _read_json)
+        self._version_cache = None
+        self._config_cache = None
+        # (inode, mtime, size) of each cached file when it was read, by cache attr
+        self._cache_stamps = {}
+        # ((config stamp, root_dir), dirs) from _get_config_dirs
+        self._config_dirs_cache = None
+        # update_history.log handle while perform_update runs
+        self._update_log_fh = None
+        # sha256 of release assets by download url, as published by github
+        self._asset_digests = {}
+        # url of a "<asset>.sha256" file by download url, fetched on demand
+        self._asset_digest_urls = {}
+        
         self.current_version = self._load_version()
+        self._current_parsed_version = _parse_version(self.current_version)
+        
+        # sent with each request; the session is shared by every Updater.
+        self._user_agent = f'cata_git_mod_manager/{self.current_version}'
         self.update_url = self._load_update_url()
         
+        # start the first update check right away so its result is usually
+        # ready by the time the user asks for it.
+        self._check_future = None
+        if self.update_url:
+            self._check_future = _run_in_thread(self._timed_check_for_updates)
+    
+    def _read_json(self, path, cache_attr):
+        """Load a JSON file, reusing the parsed data while the file is unchanged
+        
+        Args:
+            path: File to read
+            cache_attr: Name of the attribute holding the cached data
+            
+        Returns:
+            The parsed data, or None if the file doesn't exist. Parse errors
+            propagate and leave the cache empty so the next call retries.
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        # other tools write these files, so a stat decides whether the
+        # cached copy is still current.
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        data = getattr(self, cache_attr)
+        if data is None or self._cache_stamps.get(cache_attr) != stamp:
+            setattr(self, cache_attr, None)
+            with open(path, 'rb') as f:
+                data = _loads(f.read())
+            setattr(self, cache_attr, data)
+            self._cache_stamps[cache_attr] = stamp
+        return data
+    
+    def _read_version_for_write(self):
+        """Return a copy of version.json's data to modify and write back"""
+        data = self._read_json(VERSION_FILE, '_version_cache')
+        return dict(data) if data else {}
+    
+    def _write_version(self, data):
+        """Write version.json and keep the cache in sync with it
+        
+        The data goes to a temp file that then replaces version.json, so a
+        crash mid-write never leaves a truncated file behind. Nothing is
+        written when the data matches what the file already holds.
+        """
+        # callers build data from a fresh _read_json, so an equal cache means
+        # the file on disk already has this content.
+        if data == self._version_cache:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(VERSION_FILE) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_dumps(data))
+            if os.path.exists(VERSION_FILE):
+                # mkstemp creates the file private; keep the original mode.
+                shutil.copymode(VERSION_FILE, tmp_path)
+            os.replace(tmp_path, VERSION_FILE)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self._version_cache = data
+        st = os.stat(VERSION_FILE)
+        self._cache_stamps['_version_cache'] = (st.st_ino, st.st_mtime_ns, st.st_size)
+        
     def _load_version(self):
         """Load current version from version.json (tool version file)"""
-        if os.path.exists(VERSION_FILE):
-            try:
-                with open(VERSION_FILE, 'r') as f:
-                    data = json.load(f)
-                    # Try program_version first, fall back to version for backwards compatibility
-                    return data.get("program_version", data.get("version", "1.0.5"))
-            except Exception as e:
-                logging.error(f"Error loading version: {e}")
-                return "1.0.5"
+        try:
+            data = self._read_json(VERSION_FILE, '_version_cache')
+            if data is not None:
+                # Try program_version first, fall back to version for backwards compatibility
+                return data.get("program_version", data.get("version", "1.0.5"))
+        except Exception as e:
+            logging.error(f"Error loading version: {e}")
         return "1.0.5"
     
     def _load_update_url(self):
         """Load update URL from version.json"""
-        if os.path.exists(VERSION_FILE):
-            try:
-                with open(VERSION_FILE, 'r') as f:
-                    data = json.load(f)
-                    return data.get("update_url", "")
-            except Exception as e:
-                logging.error(f"Error loading update URL from version file: {e}")
+        try:
+            data = self._read_json(VERSION_FILE, '_version_cache')
+            if data is not None:
+                return data.get("update_url", "")
+        except Exception as e:
+            logging.error(f"Error loading update URL from version file: {e}")
         
         return ""
     
     def _save_version(self, version):
         """Save new version to version.json (this file ships with releases)"""
         try:
-            data = {}
-            if os.path.exists(VERSION_FILE):
-                with open(VERSION_FILE, 'r') as f:
-                    data = json.load(f)
+            data = self._read_version_for_write()
             
             # Save as program_version, keep game_version if it exists
             data["program_version"] = version
@@ -59,8 +281,7 @@ class Updater:
             if "game_version" not in data:
                 data["game_version"] = ""
             
-            with open(VERSION_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
+            self._write_version(data)
             logging.info(f"Updated program version to {version}")
         except Exception as e:
             logging.error(f"Error saving version: {e}")
@@ -68,25 +289,82 @@ class Updater:
     def save_update_url(self, url):
         """Save update URL to version.json"""
         try:
-            data = {}
-            if os.path.exists(VERSION_FILE):
-                with open(VERSION_FILE, 'r') as f:
-                    data = json.load(f)
+            data = self._read_version_for_write()
             
             data["update_url"] = url
+            # the cached validators belong to the old URL
+            data.pop("update_etag", None)
+            data.pop("update_last_modified", None)
             
-            with open(VERSION_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
+            self._write_version(data)
             logging.info(f"Saved update URL to version.json")
         except Exception as e:
             logging.error(f"Error saving update URL: {e}")
     
+    def _load_update_validators(self):
+        """Load the ETag and Last-Modified of the last release response that had no update
+        
+        Returns:
+            tuple: (etag, last_modified), empty strings when not stored
+        """
+        try:
+            data = self._read_json(VERSION_FILE, '_version_cache')
+            if data is not None:
+                return data.get("update_etag", ""), data.get("update_last_modified", "")
+        except Exception as e:
+            logging.error(f"Error loading update ETag from version file: {e}")
+        return "", ""
+    
+    def _save_update_validators(self, etag, last_modified):
+        """Save the release response ETag and Last-Modified to version.json"""
+        try:
+            data = self._read_version_for_write()
+            
+            data["update_etag"] = etag
+            data["update_last_modified"] = last_modified
+            
+            self._write_version(data)
+        except Exception as e:
+            logging.error(f"Error saving update ETag: {e}")
+    
     def check_for_updates(self):
         """Check GitHub for latest release
         
+        The first call reuses the check started in __init__ (waiting for it
+        if still running) when it found a release less than PREFETCH_MAX_AGE
+        seconds ago. A failed or stale prefetch, and every later call, queries
+        GitHub again.
+        
         Returns:
             tuple: (has_update, latest_version, download_url, release_notes)
         """
+        future, self._check_future = self._check_future, None
+        if future is not None:
+            try:
+                finished, result = future.result()
+            except Exception as e:
+                logging.error(f"Startup update check failed: {e}")
+            else:
+                # failed checks come back without a version; retry those.
+                if result[1] and time.monotonic() - finished < PREFETCH_MAX_AGE:
+                    return result
+        return self._check_for_updates()
+    
+    def check_for_updates_async(self):
+        """Run check_for_updates on a background thread
+        
+        Returns:
+            Future: resolves to check_for_updates' result
+        """
+        return _run_in_thread(self.check_for_updates)
+    
+    def _timed_check_for_updates(self):
+        """Run _check_for_updates, returning (time.monotonic() when done, result)"""
+        result = self._check_for_updates()
+        return time.monotonic(), result
+    
+    def _check_for_updates(self):
+        """Query GitHub for the latest release, see check_for_updates"""
         if not self.update_url:
             logging.warning("No update URL configured")
             return False, None, None, None
@@ -94,23 +372,43 @@ class Updater:
         try:
             logging.info(f"Checking for updates from: {self.update_url}")
             
+            # github answers 304 (no body, no rate limit hit) if the release
+            # hasn't changed since the last check that found no update.
+            headers = {'Accept': 'application/vnd.github+json', 'User-Agent': self._user_agent}
+            etag, last_modified = self._load_update_validators()
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+            
             # Check if URL points to a specific tag
             if "/tags/" in self.update_url:
                 # Specific tag URL
-                response = requests.get(self.update_url, timeout=15)
+                response = self._session.get(self.update_url, timeout=15, headers=headers)
+                if response.status_code == 304:
+                    logging.info("Release unchanged since last check")
+                    return False, self.current_version, None, None
                 response.raise_for_status()
-                release_data = response.json()
+                validators = (response.headers.get("ETag", ""), response.headers.get("Last-Modified", ""))
+                release_data = _loads(response.content)
             else:
                 # Try /latest first, if that fails try /releases
-                response = requests.get(self.update_url, timeout=15)
+                response = self._session.get(self.update_url, timeout=15, headers=headers)
+                validators = (response.headers.get("ETag", ""), response.headers.get("Last-Modified", ""))
                 
-                if response.status_code == 404:
-                    # /latest doesn't exist, try getting all releases
+                if response.status_code == 304:
+                    logging.info("Release unchanged since last check")
+                    return False, self.current_version, None, None
+                elif response.status_code == 404:
+                    # /latest doesn't exist; only releases[0] is used, so ask for one.
                     base_url = self.update_url.replace("/releases/latest", "/releases")
+                    base_url += ("&" if "?" in base_url else "?") + "per_page=1"
                     logging.info(f"Latest endpoint not found, trying: {base_url}")
-                    response = requests.get(base_url, timeout=15)
+                    response = self._session.get(base_url, timeout=15, headers={
+                        'Accept': 'application/vnd.github+json', 'User-Agent': self._user_agent
+                    })
                     response.raise_for_status()
-                    releases = response.json()
+                    releases = _loads(response.content)
                     
                     if not releases or len(releases) == 0:
                         logging.warning("No releases found")
@@ -118,8 +416,9 @@ class Updater:
                     
                     # Use the first (most recent) release
                     release_data = releases[0]
+                    validators = ("", "")
                 elif response.status_code == 200:
-                    release_data = response.json()
+                    release_data = _loads(response.content)
                 else:
                     response.raise_for_status()
                     return False, None, None, None
@@ -131,8 +430,7 @@ class Updater:
             # some repos use "latest" as tag; extract version from release name instead.
             if latest_version == "latest" or not latest_version:
                 release_name = release_data.get("name", "")
-                import re
-                version_match = re.search(r'(\d+\.\d+\.\d+)', release_name)
+                version_match = _VERSION_RE.search(release_name)
                 if version_match:
                     latest_version = version_match.group(1)
                     logging.info(f"Extracted version {latest_version} from release name: {release_name}")
@@ -151,6 +449,22 @@ class Updater:
                 if asset.get("name", "").endswith(".zip"):
                     download_url = asset.get("browser_download_url")
                     logging.info(f"Found asset download URL: {download_url}")
+                    # github reports asset digests as "sha256:<hex>"; older
+                    # releases may list the checksum in the notes instead.
+                    digest = asset.get("digest") or ""
+                    if digest.startswith("sha256:"):
+                        digest = digest[len("sha256:"):]
+                    else:
+                        digest = self._digest_from_notes(release_notes, asset.get("name", ""))
+                    if download_url and digest:
+                        self._asset_digests[download_url] = digest.lower()
+                    elif download_url:
+                        # last resort: a checksum file published next to the zip.
+                        checksum_name = asset.get("name", "") + ".sha256"
+                        for other in assets:
+                            if other.get("name") == checksum_name and other.get("browser_download_url"):
+                                self._asset_digest_urls[download_url] = other["browser_download_url"]
+                                break
                     break
             
             # fallback to github's automatic zipball url.
@@ -166,6 +480,11 @@ class Updater:
             has_update = self._compare_versions(self.current_version, latest_version)
             logging.info(f"Version comparison - Current: {self.current_version}, Latest: {latest_version}, Has update: {has_update}")
             
+            # only remember the validators when there's nothing to install, so
+            # a declined update is still offered on the next check.
+            if any(validators) and not has_update:
+                self._save_update_validators(*validators)
+            
             return has_update, latest_version, download_url, release_notes
             
         except requests.exceptions.Timeout:
@@ -184,88 +503,258 @@ class Updater:
             logging.error(f"Unexpected error checking for updates: {e}")
             return False, None, None, None
     
+    def _digest_from_notes(self, release_notes, asset_name):
+        """Find a "sha256: <hex>" checksum for asset_name in the release notes
+        
+        Only a checksum on the same line as the asset name counts; notes often
+        list hashes for source tarballs too, and a wrong digest would make the
+        release impossible to install.
+        """
+        if not asset_name:
+            return None
+        for line in (release_notes or "").splitlines():
+            if asset_name in line:
+                match = _SHA256_RE.search(line)
+                if match:
+                    return match.group(1)
+        return None
+    
+    def _fetch_digest_file(self, download_url):
+        """Fetch the sha256 from the checksum asset published for download_url
+        
+        Returns None when there is no such asset or it can't be read; the
+        update then goes ahead unverified, as it does without any digest.
+        """
+        checksum_url = self._asset_digest_urls.get(download_url)
+        if not checksum_url:
+            return None
+        try:
+            response = self._session.get(checksum_url, timeout=15, headers={'User-Agent': self._user_agent})
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"Could not fetch checksum file {checksum_url}: {e}")
+            return None
+        match = _SHA256_FILE_RE.search(response.text.strip())
+        if not match:
+            logging.warning(f"No sha256 found in checksum file {checksum_url}")
+            return None
+        digest = match.group(1).lower()
+        self._asset_digests[download_url] = digest
+        return digest
+    
     def _compare_versions(self, current, latest):
         """Compare version strings
         
         Returns True if latest > current
         """
-        try:
-            # parse semantic versions (e.g., "1.0.5" -> [1, 0, 5]).
-            current_parts = [int(x) for x in current.split('.')]
-            latest_parts = [int(x) for x in latest.split('.')]
-            
-            # pad shorter version with zeros for comparison.
-            max_len = max(len(current_parts), len(latest_parts))
-            current_parts += [0] * (max_len - len(current_parts))
-            latest_parts += [0] * (max_len - len(latest_parts))
-            
-            return latest_parts > current_parts
-        except:
+        if current == self.current_version:
+            current_parts = self._current_parsed_version
+        else:
+            current_parts = _parse_version(current)
+        latest_parts = _parse_version(latest)
+        
+        if current_parts is None or latest_parts is None:
             # If version comparison fails (non-semantic version like "update_test"),
             # check if versions are different - if so, treat as update available
             if current != latest:
                 logging.info(f"Non-semantic version detected: {latest}. Treating as update available.")
                 return True
             return False
+        
+        return latest_parts > current_parts
+    
+    def _get_config_dirs(self, root_dir):
+        """Map configured paths inside root_dir to their top-level directory
+        
+        Memoized on the config file's stamp and root_dir, so the JSON parse and
+        path math only rerun when the config changes.
+        
+        Returns:
+            list: (top_level, configured_path) pairs
+        """
+        config = self._read_json(CONFIG_FILE, '_config_cache')
+        if config is None:
+            return []
+        
+        key = (self._cache_stamps.get('_config_cache'), root_dir)
+        if self._config_dirs_cache is not None and self._config_dirs_cache[0] == key:
+            return self._config_dirs_cache[1]
+        
+        # check configured paths.
+        paths_to_check = [
+            config.get("game_install_dir", ""),
+            config.get("backup_dir", ""),
+            config.get("mod_install_dir", "")
+        ]
+        
+        config_dirs = []
+        root = Path(root_dir)
+        for path in paths_to_check:
+            if not path:
+                continue
+            
+            # only preserve if path is inside the tool directory. abspath
+            # rather than resolve(): a symlinked dir inside root_dir counts.
+            try:
+                rel = Path(os.path.abspath(path)).relative_to(root)
+            except ValueError:
+                # outside root_dir (or on a different drive on windows); skip.
+                continue
+            if rel.parts:
+                # extract top-level directory name.
+                config_dirs.append((rel.parts[0], path))
+        
+        self._config_dirs_cache = (key, config_dirs)
+        return config_dirs
     
     def _get_preserved_dirs(self):
-        """Get list of directories to preserve, including dynamic paths from config"""
-        preserved = list(BASE_PRESERVED_DIRS)
+        """Get set of directories to preserve, including dynamic paths from config"""
+        preserved = set(BASE_PRESERVED_DIRS)
         
         # scan config for additional paths that exist inside the tool directory.
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, 'r') as f:
-                    config = json.load(f)
-                
-                # check configured paths.
-                paths_to_check = [
-                    config.get("game_install_dir", ""),
-                    config.get("backup_dir", ""),
-                    config.get("mod_install_dir", "")
-                ]
+        try:
+            root_dir = os.getcwd()
+            for top_level, path in self._get_config_dirs(root_dir):
+                local_path = os.path.join(root_dir, top_level)
                 
-                root_dir = os.getcwd()
-                for path in paths_to_check:
-                    if not path:
-                        continue
-                    
-                    abs_path = os.path.abspath(path)
-                    
-                    # only preserve if path is inside the tool directory.
-                    try:
-                        rel_path = os.path.relpath(abs_path, root_dir)
-                        # paths starting with ".." are outside root_dir.
-                        if not rel_path.startswith('..'):
-                            # extract top-level directory name.
-                            top_level = rel_path.split(os.sep)[0]
-                            local_path = os.path.join(root_dir, top_level)
-                            
-                            # only add if it exists and isn't already in the list.
-                            if top_level and top_level not in preserved and os.path.exists(local_path):
-                                preserved.append(top_level)
-                                logging.info(f"Will preserve directory from config: {top_level} (exists at {local_path})")
-                            elif not os.path.exists(local_path):
-                                logging.info(f"Skipping {top_level} from config path {path} - doesn't exist locally")
-                    except ValueError:
-                        # different drives on windows; skip.
-                        pass
-            except Exception as e:
-                logging.error(f"Error reading config for preserved dirs: {e}")
+                # existence is checked every time: the launcher may have
+                # created the game dir since the config was last read.
+                if top_level and top_level not in preserved and os.path.exists(local_path):
+                    preserved.add(top_level)
+                    logging.info(f"Will preserve directory from config: {top_level} (exists at {local_path})")
+                elif not os.path.exists(local_path):
+                    logging.info(f"Skipping {top_level} from config path {path} - doesn't exist locally")
+        except Exception as e:
+            logging.error(f"Error reading config for preserved dirs: {e}")
         
-        return preserved
+        return frozenset(preserved)
     
     def _log_update(self, message):
         """Log to both regular log and permanent update history log"""
         logging.info(message)
         try:
-            import datetime
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            with open(UPDATE_LOG_FILE, 'a') as f:
-                f.write(f"[{timestamp}] {message}\n")
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+            line = f"[{timestamp}] {message}\n"
+            # perform_update keeps the log open; otherwise open it per call.
+            if self._update_log_fh is not None:
+                self._update_log_fh.write(line)
+            else:
+                with open(UPDATE_LOG_FILE, 'a') as f:
+                    f.write(line)
         except Exception as e:
             logging.error(f"Failed to write to update log: {e}")
     
+    def _extract_zip(self, zip_file, extract_dir, skip=frozenset()):
+        """Extract a release archive straight into its staging layout
+        
+        Args:
+            zip_file: Path or seekable file object holding the archive
+            extract_dir: Directory to extract into
+            skip: Top-level names not to extract (preserved user data)
+        
+        GitHub's single wrapper folder is stripped while extracting, so
+        extract_dir ends up holding the release contents directly. Members are
+        streamed with ZipFile.open; the workers share one ZipFile, whose reads
+        are serialized by zipfile itself while decompression runs in parallel.
+        Small archives are extracted serially.
+        """
+        with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+            infos = zip_ref.infolist()
+            
+            # sanitize like ZipFile.extract: no drives, no "..", no absolute paths.
+            members = []
+            for info in infos:
+                name = os.path.splitdrive(info.filename)[1]
+                if os.sep == '\\':
+                    name = name.replace('\\', '/')
+                members.append((info, [p for p in name.split('/') if p not in ('', '.', '..')]))
+            
+            # github zips typically have one top-level folder; strip it.
+            top_levels = {parts[0] for _, parts in members if parts}
+            strip = len(top_levels) == 1 and all(
+                len(parts) > 1 or info.is_dir() for info, parts in members if parts
+            )
+            
+            # create directories up front so workers don't race on makedirs.
+            jobs = []
+            made_dirs = set()
+            for info, parts in members:
+                if strip:
+                    parts = parts[1:]
+                if not parts or parts[0] in skip:
+                    continue
+                target = os.path.join(extract_dir, *parts)
+                parent = target if info.is_dir() else os.path.dirname(target)
+                if parent not in made_dirs:
+                    os.makedirs(parent, exist_ok=True)
+                    made_dirs.add(parent)
+                if not info.is_dir():
+                    jobs.append((info, target))
+            
+            def extract_one(job):
+                info, target = job
+                with zip_ref.open(info) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, EXTRACT_CHUNK_SIZE)
+                mtime = time.mktime(info.date_time + (0, 0, -1))
+                os.utime(target, (mtime, mtime))
+            
+            if len(jobs) < PARALLEL_EXTRACT_MIN_FILES:
+                for job in jobs:
+                    extract_one(job)
+                return
+            
+            with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+                list(executor.map(extract_one, jobs))
+    
+    def _check_disk_space(self, zip_file, target_dir):
+        """Fail before extracting if target_dir's filesystem can't hold the archive
+        
+        Only reads the zip's central directory, so this is cheap.
+        """
+        with zipfile.ZipFile(zip_file, 'r') as zip_ref:
+            needed = sum(info.file_size for info in zip_ref.infolist())
+        free = shutil.disk_usage(target_dir).free
+        if needed > free:
+            raise OSError(
+                errno.ENOSPC,
+                f"Not enough disk space to extract update: need {needed / 1024 / 1024:.2f} MB, "
+                f"{free / 1024 / 1024:.2f} MB free"
+            )
+    
+    def _unzip(self, unzip, zip_path, extract_dir, skip=frozenset()):
+        """Extract an archive with the system unzip binary
+        
+        Args:
+            skip: Top-level names (below any wrapper folder) not to extract
+        
+        Returns:
+            bool: True on success, False if the caller should fall back to zipfile
+        """
+        # exclude preserved entries up front so they are never written.
+        excludes = []
+        if skip:
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                top_levels = {name.split('/', 1)[0] for name in zip_ref.namelist()}
+            prefix = f"{top_levels.pop()}/" if len(top_levels) == 1 else ""
+            for name in sorted(skip):
+                excludes += [prefix + name, f"{prefix}{name}/*"]
+        cmd = [unzip, '-q', '-o', zip_path, '-d', extract_dir]
+        if excludes:
+            cmd += ['-x', *excludes]
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        # exit code 1 means warnings only; the files were still extracted.
+        if result.returncode > 1:
+            logging.warning(f"unzip failed ({result.returncode}), falling back to zipfile: {result.stderr.strip()}")
+            shutil.rmtree(extract_dir, ignore_errors=True)
+            os.makedirs(extract_dir, exist_ok=True)
+            return False
+        return True
+    
     def perform_update(self, download_url, new_version):
         """Download and apply update while preserving user data
         
@@ -278,154 +767,185 @@ class Updater:
         """
         root_dir = os.getcwd()
         
+        # one buffered handle for the whole update; it is flushed before the
+        # destructive steps and closed (flushed) when the update finishes.
+        try:
+            self._update_log_fh = open(UPDATE_LOG_FILE, 'a')
+        except OSError as e:
+            logging.error(f"Failed to open update log: {e}")
+        
         self._log_update("="*60)
         self._log_update(f"UPDATE STARTED: {self.current_version} → {new_version}")
         self._log_update(f"Download URL: {download_url}")
         
-        # Get list of directories to preserve (including dynamic paths)
+        # Get list of directories to preserve (including dynamic paths).
         PRESERVED_DIRS = self._get_preserved_dirs()
-        self._log_update(f"Preserving directories: {PRESERVED_DIRS}")
-        self._log_update(f"Preserving files: {PRESERVED_FILES}")
+        self._log_update(f"Preserving directories: {sorted(PRESERVED_DIRS)}")
+        self._log_update(f"Preserving files: {sorted(PRESERVED_FILES)}")
+        
+        # user data is never moved or copied: extraction and steps 3 and 4
+        # all skip preserved dirs and files, so they stay where they are.
+        skipped = PRESERVED_DIRS | PRESERVED_FILES
         
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
+            # stage the release inside root_dir: same filesystem, so Step 4
+            # can rename files into place.
+            with tempfile.TemporaryDirectory(dir=root_dir, prefix=".update_") as temp_dir:
                 # Step 1: Download the new version
                 self._log_update(f"STEP 1: Downloading update from {download_url}")
-                zip_path = os.path.join(temp_dir, "update.zip")
-                
-                # Download with timeout and streaming for large files
-                response = requests.get(download_url, timeout=60, stream=True)
-                response.raise_for_status()
-                
-                # Write in chunks for better memory efficiency
-                total_size = int(response.headers.get('content-length', 0))
-                self._log_update(f"Download size: {total_size / 1024 / 1024:.2f} MB")
-                
-                with open(zip_path, 'wb') as f:
-                    downloaded = 0
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                
-                self._log_update(f"Download complete: {downloaded / 1024 / 1024:.2f} MB")
-                
-                self._log_update(f"STEP 2: Extracting update to temporary location")
-                # Step 2: Extract to temporary location
-                extract_dir = os.path.join(temp_dir, "extracted")
-                os.makedirs(extract_dir, exist_ok=True)
-                
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    zip_ref.extractall(extract_dir)
-                
-                # github zips typically have one top-level folder; unwrap it.
-                extracted_items = os.listdir(extract_dir)
-                if len(extracted_items) == 1 and os.path.isdir(os.path.join(extract_dir, extracted_items[0])):
-                    source_dir = os.path.join(extract_dir, extracted_items[0])
-                else:
-                    source_dir = extract_dir
+                with contextlib.ExitStack() as stack:
+                    # Download with timeout and streaming for large files
+                    response = stack.enter_context(
+                        self._session.get(
+                            download_url, timeout=60, stream=True, headers={'User-Agent': self._user_agent}
+                        )
+                    )
+                    response.raise_for_status()
+                    
+                    total_size = int(response.headers.get('content-length', 0))
+                    self._log_update(f"Download size: {total_size / 1024 / 1024:.2f} MB")
+                    
+                    # big archives are handed to the system unzip, which needs a
+                    # real file. anything else is kept in memory and only spills
+                    # to disk (inside temp_dir) once it outgrows DOWNLOAD_SPOOL_SIZE.
+                    unzip = shutil.which("unzip") if total_size > UNZIP_MIN_SIZE else None
+                    if unzip:
+                        zip_path = os.path.join(temp_dir, "update.zip")
+                        archive = stack.enter_context(open(zip_path, 'w+b'))
+                    else:
+                        archive = stack.enter_context(
+                            tempfile.SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_SIZE, dir=temp_dir)
+                        )
+                    
+                    # copy straight from the socket in 1 MiB blocks, hashing
+                    # each block as it arrives. one buffer is reused throughout.
+                    response.raw.decode_content = True
+                    sha256 = hashlib.sha256()
+                    buf = memoryview(bytearray(DOWNLOAD_CHUNK_SIZE))
+                    while True:
+                        n = response.raw.readinto(buf)
+                        if not n:
+                            break
+                        sha256.update(buf[:n])
+                        archive.write(buf[:n])
+                    downloaded = archive.tell()
+                    response.close()
+                    
+                    self._log_update(f"Download complete: {downloaded / 1024 / 1024:.2f} MB")
+                    
+                    # fail before extracting if the archive is truncated or corrupt.
+                    expected_digest = (
+                        self._asset_digests.get(download_url) or self._fetch_digest_file(download_url)
+                    )
+                    if expected_digest:
+                        if sha256.hexdigest() != expected_digest:
+                            raise ValueError(
+                                f"Checksum mismatch: expected sha256 {expected_digest}, got {sha256.hexdigest()}"
+                            )
+                        self._log_update(f"  ✓ Checksum verified (sha256)")
+                    
+                    self._log_update(f"STEP 2: Extracting update to temporary location")
+                    # Step 2: Extract to temporary location
+                    extract_dir = os.path.join(temp_dir, "extracted")
+                    os.makedirs(extract_dir, exist_ok=True)
+                    
+                    archive.flush()
+                    archive.seek(0)
+                    self._check_disk_space(archive, extract_dir)
+                    if unzip and self._unzip(unzip, zip_path, extract_dir, skipped):
+                        # github zips typically have one top-level folder; unwrap it.
+                        with os.scandir(extract_dir) as it:
+                            extracted_items = list(it)
+                        if len(extracted_items) == 1 and extracted_items[0].is_dir():
+                            source_dir = extracted_items[0].path
+                        else:
+                            source_dir = extract_dir
+                    else:
+                        # preserved entries in the release are never written.
+                        archive.seek(0)
+                        self._extract_zip(archive, extract_dir, skipped)
+                        source_dir = extract_dir
                 
-                # Step 3: Backup user data to temp location
-                self._log_update(f"STEP 3: Backing up user data to temp location")
-                backup_dir = os.path.join(temp_dir, "user_backup")
-                os.makedirs(backup_dir, exist_ok=True)
+                self._log_update(f"STEP 3: Removing old files (keeping preserved data in place)")
+                if self._update_log_fh is not None:
+                    self._update_log_fh.flush()
+                # Step 3: Remove old files
+                # Preserved data in the release is never installed
+                with os.scandir(source_dir) as it:
+                    source_entries = [entry for entry in it if entry.name not in skipped]
+                new_entries = {entry.name: entry.is_dir() for entry in source_entries}
                 
-                # backup directories.
-                for item in PRESERVED_DIRS:
-                    src = os.path.join(root_dir, item)
-                    if os.path.exists(src):
-                        dst = os.path.join(backup_dir, item)
+                # scandir entries carry the file type, so no extra stat per item.
+                # entries the release ships with the same type are replaced in
+                # Step 4 instead, so they never go missing in between.
+                with os.scandir(root_dir) as it:
+                    for entry in it:
+                        if entry.name in skipped or entry.path == temp_dir:
+                            continue
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        if new_entries.get(entry.name) == is_dir:
+                            continue
                         try:
-                            if os.path.isdir(src):
-                                # preserve symlinks, skip dangling ones.
-                                shutil.copytree(src, dst, symlinks=True, ignore_dangling_symlinks=True)
-                                self._log_update(f"  ✓ Backed up directory: {item}")
+                            if is_dir:
+                                shutil.rmtree(entry.path)
                             else:
-                                shutil.copy2(src, dst)
-                                self._log_update(f"  ✓ Backed up file: {item}")
+                                os.remove(entry.path)
                         except Exception as e:
-                            self._log_update(f"  ✗ Failed to backup {item}: {e}")
-                            raise
-                    else:
-                        self._log_update(f"  - Skipping {item} (doesn't exist)")
-                
-                for item in PRESERVED_FILES:
-                    src = os.path.join(root_dir, item)
-                    if os.path.exists(src):
-                        dst = os.path.join(backup_dir, item)
-                        shutil.copy2(src, dst)
-                        self._log_update(f"  ✓ Backed up file: {item}")
+                            logging.warning(f"Could not remove {entry.name}: {e}")
                 
-                self._log_update(f"STEP 4: Removing old files")
-                # Step 4: Remove ALL old files (we have backups of preserved data)
-                for item in os.listdir(root_dir):
-                    item_path = os.path.join(root_dir, item)
-                    try:
-                        if os.path.isdir(item_path):
-                            shutil.rmtree(item_path)
-                        else:
-                            os.remove(item_path)
-                    except Exception as e:
-                        logging.warning(f"Could not remove {item}: {e}")
-                
-                self._log_update(f"STEP 5: Installing new files (skipping preserved directories)")
-                # Step 5: Copy new files (SKIP preserved directories completely)
-                for item in os.listdir(source_dir):
-                    src = os.path.join(source_dir, item)
-                    dst = os.path.join(root_dir, item)
-                    
-                    # Skip if this is a preserved directory - don't copy from new release at all
-                    if item in PRESERVED_DIRS:
-                        continue
+                self._log_update(f"STEP 4: Installing new files (skipping preserved data)")
+                # Step 4: Move new files into place (SKIP preserved directories and files completely)
+                # the extracted release is staged inside root_dir, so each entry
+                # is a single rename rather than a copy of its contents.
+                # files overwrite their old copy atomically; directories can't
+                # be renamed over a non-empty one, so the old tree goes first.
+                to_copy = []
+                for entry in source_entries:
+                    src = entry.path
+                    dst = os.path.join(root_dir, entry.name)
                     
-                    if os.path.isdir(src):
-                        if os.path.exists(dst):
-                            shutil.rmtree(dst)
-                        shutil.copytree(src, dst)
-                    else:
-                        shutil.copy2(src, dst)
+                    is_dir = new_entries[entry.name]
+                    if is_dir and os.path.isdir(dst) and not os.path.islink(dst):
+                        shutil.rmtree(dst)
+                    try:
+                        os.replace(src, dst)
+                    except OSError:
+                        # e.g. a leftover entry that couldn't be removed; copy over it.
+                        to_copy.append((src, dst, is_dir))
                 
-                self._log_update(f"STEP 6: Restoring user data from backup")
-                # Step 6: Restore user data (ALWAYS restore from backup, NEVER from new release)
-                for item in PRESERVED_DIRS:
-                    src = os.path.join(backup_dir, item)
-                    dst = os.path.join(root_dir, item)
+                # copy whatever couldn't be renamed, one pool job per file so a
+                # big directory is spread across workers; the first error to
+                # come back fails the update.
+                if to_copy:
+                    file_jobs = []
+                    for src, dst, is_dir in to_copy:
+                        if not is_dir:
+                            file_jobs.append((src, dst))
+                            continue
+                        for dirpath, dirnames, filenames in os.walk(src, followlinks=True):
+                            dst_dir = os.path.join(dst, os.path.relpath(dirpath, src))
+                            os.makedirs(dst_dir, exist_ok=True)
+                            for name in filenames:
+                                file_jobs.append((os.path.join(dirpath, name), os.path.join(dst_dir, name)))
                     
-                    if os.path.exists(src):
-                        # Always use the backed up version
-                        # Remove any directory that might exist from the new release
-                        if os.path.exists(dst):
-                            if os.path.isdir(dst):
-                                shutil.rmtree(dst)
-                            else:
-                                os.remove(dst)
-                        
-                        # Restore the backed up directory/file
-                        if os.path.isdir(src):
-                            shutil.copytree(src, dst, symlinks=True, ignore_dangling_symlinks=True)
-                            self._log_update(f"  ✓ Restored directory: {item}")
-                        else:
-                            shutil.copy2(src, dst)
-                            self._log_update(f"  ✓ Restored file: {item}")
-                
-                for item in PRESERVED_FILES:
-                    src = os.path.join(backup_dir, item)
-                    if os.path.exists(src):
-                        dst = os.path.join(root_dir, item)
-                        shutil.copy2(src, dst)
-                        self._log_update(f"  ✓ Restored file: {item}")
+                    with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+                        futures = [executor.submit(_fast_copy, src, dst) for src, dst in file_jobs]
+                        for future in as_completed(futures):
+                            future.result()
                 
-                # Step 7: Update version file
+                # Step 5: Update version file
                 # Note: new_version comes from the GitHub tag name
-                # The new release's version.json was already installed in Step 5
+                # The new release's version.json was already installed in Step 4
                 # We only update it if it doesn't match
-                self._log_update(f"STEP 7: Verifying version file")
+                self._log_update(f"STEP 5: Verifying version file")
                 
-                # Read what version the new release has
+                # Read what version the new release has. The file was just
+                # replaced (new inode), so this parses it fresh and leaves the
+                # cache holding the new data.
                 if os.path.exists(VERSION_FILE):
                     try:
-                        with open(VERSION_FILE, 'r') as f:
-                            new_version_data = json.load(f)
+                        new_version_data = self._read_json(VERSION_FILE, '_version_cache')
+                        if new_version_data is not None:
                             # Check for program_version first, fall back to version
                             installed_version = new_version_data.get("program_version", new_version_data.get("version", new_version))
                             game_version = new_version_data.get("game_version", "")
@@ -455,6 +975,21 @@ class Updater:
             logging.error(f"Error performing update: {e}")
             logging.error(f"Traceback:\n{traceback.format_exc()}")
             return False
+        finally:
+            if self._update_log_fh is not None:
+                self._update_log_fh.close()
+                self._update_log_fh = None
+    
+    def perform_update_async(self, download_url, new_version):
+        """Run perform_update on a background thread
+        
+        The thread is not a daemon, so the interpreter waits for a running
+        update to finish instead of killing it halfway through.
+        
+        Returns:
+            Future: resolves to perform_update's result
+        """
+        return _run_in_thread(self.perform_update, download_url, new_version, daemon=False)
     
     def get_current_version(self):
         """Return the current version string"""